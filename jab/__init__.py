@@ -1,8 +1,10 @@
 from jab.exceptions import (
+    CircularDependency,
     InvalidLifecycleMethod,
     MissingDependency,
     NoAnnotation,
     NoConstructor,
+    UnknownConstructor,
     DuplicateProvide,
 )
 from jab.harness import Harness  # NOQA
@@ -17,3 +19,5 @@ class Exceptions:
     MissingDependency = MissingDependency
     InvalidLifecycleMethod = InvalidLifecycleMethod
     DuplicateProvide = DuplicateProvide
+    CircularDependency = CircularDependency
+    UnknownConstructor = UnknownConstructor
@@ -20,3 +20,7 @@ class UnknownConstructor(Exception):
 
 class DuplicateProvide(Exception):
     pass
+
+
+class CircularDependency(Exception):
+    pass
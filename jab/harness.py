@@ -1,15 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from inspect import isclass, iscoroutinefunction, isfunction, ismethod
-from typing import Any, Callable, Dict, List, Optional, Type, Union, get_type_hints, overload
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_type_hints,
+    overload,
+)
 
-import toposort
 import uvloop
-from typing_extensions import Protocol
 
 from jab.asgi import EventHandler, Handler, Receive, Send, NoopHandler
 from jab.exceptions import (
+    CircularDependency,
     DuplicateProvide,
     InvalidLifecycleMethod,
     MissingDependency,
@@ -19,9 +34,86 @@ from jab.exceptions import (
 )
 from jab.inspect import Dependency, Provided
 from jab.logging import DefaultJabLogger, Logger
-from jab.search import isimplementation
+from jab.search import _cached_type_hints, _is_protocol, isimplementation
 
 DEFAULT_LOGGER = "DEFAULT LOGGER"
+LIFECYCLE_METHODS = ("on_start", "on_stop", "run")
+
+_WHITE, _GRAY, _BLACK = 0, 1, 2
+
+LifecycleCall = Tuple[str, Callable[..., Any], bool]
+StartCall = Tuple[str, Callable[..., Any], bool, Dict[str, Any]]
+
+
+def _lifecycle_calls(
+    lifecycles: Mapping[str, Mapping[str, Tuple[Callable[..., Any], bool]]], method: str, names: Iterable[str]
+) -> List[LifecycleCall]:
+    """
+    `_lifecycle_calls` collects the `method` lifecycle methods of the named objects, in
+    the given order, skipping objects that don't define it.
+    """
+    calls = []
+    for x in names:
+        entry = lifecycles.get(x, {}).get(method)
+        if entry is not None:
+            calls.append((x, entry[0], entry[1]))
+
+    return calls
+
+
+def _toposort(deps: Mapping[str, Iterable[str]]) -> List[str]:
+    """
+    `_toposort` orders the nodes of a dependency graph so that every node appears
+    after all of its dependencies. A single iterative depth-first search both
+    emits the order and detects cycles. Nodes that only appear as dependencies
+    are included in the returned order.
+
+    Parameters
+    ----------
+    deps : Mapping[str, Iterable[str]]
+        A mapping of each node to the nodes it depends on.
+
+    Returns
+    -------
+    List[str]
+        The nodes of the graph in dependency order.
+
+    Raises
+    ------
+    CircularDependency
+        If the graph contains a cycle. The full cycle path is included in the
+        exception message.
+    """
+    color: Dict[str, int] = {}
+    order: List[str] = []
+
+    for root in deps:
+        if color.get(root, _WHITE) != _WHITE:
+            continue
+
+        color[root] = _GRAY
+        stack: List[Tuple[str, Iterator[str]]] = [(root, iter(deps[root]))]
+
+        while stack:
+            node, reqs = stack[-1]
+            for req in reqs:
+                state = color.get(req, _WHITE)
+                if state == _WHITE:
+                    color[req] = _GRAY
+                    stack.append((req, iter(deps.get(req, ()))))
+                    break
+
+                if state == _GRAY:
+                    path = [n for n, _ in stack]
+                    start = path.index(req)
+                    cycle = path[start:] + [req]
+                    raise CircularDependency(f"Circular dependency found: {' -> '.join(cycle)}")
+            else:
+                stack.pop()
+                color[node] = _BLACK
+                order.append(node)
+
+    return order
 
 
 class Harness:
@@ -35,13 +127,30 @@ class Harness:
         asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
         self._provided: Dict[str, Any] = {}
-        self._dep_graph: Dict[Any, Dict[str, Any]] = {}
+        self._concrete_index: Dict[Tuple[str, str], str] = {}
+        self._dep_graph: Dict[str, Tuple[Tuple[str, str], ...]] = {}
         self._env: Dict[str, Any] = {}
         self._exec_order: List[str] = []
-        self._loop = asyncio.get_event_loop()
+        self._exec_levels: List[List[str]] = []
+        self._start_calls: List[StartCall] = []
+        self._run_calls: List[LifecycleCall] = []
+        self._stop_calls: List[List[LifecycleCall]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._logger = DefaultJabLogger()
         self._asgi_handler: EventHandler = NoopHandler()
 
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        `_event_loop` returns the Harness's event loop, creating it on first use so that
+        a Harness that is never run or never builds an async constructor does not
+        allocate one. A new loop is also created if the previous one has been closed.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+        return self._loop
+
     @overload
     def inspect(self) -> List[Provided]:
         pass  # pragma: no cover
@@ -64,7 +173,7 @@ class Harness:
         arg : Optional[Union[Type, Callable]]
             Optional argument of either a class or a functional constructor.
             If no argument is provided, a full inspection record of all
-            provided classes is returned
+            provided classes constructed by the last build is returned
 
         Returns
         -------
@@ -75,7 +184,7 @@ class Harness:
         if arg:
             return self._build_inspect(arg)
 
-        return [self._build_inspect(x) for x in self._provided.values()]
+        return [self._build_inspect(x) for name, x in self._provided.items() if name in self._env]
 
     def _build_inspect(self, arg: Any) -> Provided:
         """
@@ -124,14 +233,14 @@ class Harness:
                 ((name, obj) for name, obj in self._env.items() if isinstance(obj, t)), (None, None)
             )
 
-        if not name or not obj:
+        if name is None:
             raise UnknownConstructor(f"{arg} not registered with jab harness")
 
         matched = self._dep_graph[name]
 
         dependencies = [
             Dependency(provided=self._build_inspect(self._provided[x]), parameter=p, type=deps[p])
-            for p, x in matched.items()
+            for p, x in matched
         ]
 
         return Provided(name=name, constructor=arg, obj=obj, dependencies=dependencies)
@@ -153,30 +262,59 @@ class Harness:
                 continue
 
             self._check_provide(arg)
-            name = arg.__name__
-
-            if isfunction(arg):
-                name = get_type_hints(arg)["return"].__name__
-
-                closures = arg.__closure__ or []
-                for free_var in closures:
-                    try:
-                        name = free_var.cell_contents._jab
-                    except AttributeError:
-                        pass
+            name, t = self._constructor_name(arg)
 
             if self._provided.get(name):
                 raise DuplicateProvide(
                     f'Cannot provide object {arg} under name "{name}". Name is already taken by object {self._provided[name]}'  # NOQA
                 )
             self._provided[name] = arg
+            self._concrete_index.setdefault((t.__module__, t.__name__), name)
 
         return self
 
-    def _build_graph(self) -> None:
+    def _constructor_name(self, arg: Any) -> Tuple[str, Any]:
+        """
+        `_constructor_name` determines the name a constructor is provided under along with the
+        type it constructs. Functional constructors are named after their return type unless
+        they are `jab.closure`s, which are named after their unique `_jab` attribute.
+
+        Parameters
+        ----------
+        arg : Any
+            A class definition or functional constructor.
+
+        Returns
+        -------
+        Tuple[str, Any]
+            The name of the constructor and the type of the object it constructs.
+        """
+        name = arg.__name__
+        t = arg
+
+        if isfunction(arg):
+            t = get_type_hints(arg)["return"]
+            name = t.__name__
+
+            closures = arg.__closure__ or []
+            for free_var in closures:
+                try:
+                    name = free_var.cell_contents._jab
+                except AttributeError:
+                    pass
+
+        return name, t
+
+    def _build_graph(self, roots: Iterable[str] = ()) -> None:
         """
         `_build_graph` builds the dependency graph based on the type annotations of the provided
-        constructors.
+        constructors. Only the roots and the objects they transitively depend on are resolved.
+
+        Parameters
+        ----------
+        roots : Iterable[str]
+            Names of the provided objects the graph is built from. If empty, every provided
+            object is a root.
 
         Raises
         ------
@@ -184,71 +322,143 @@ class Harness:
             If a class's constructor requires a dependency that has not been provided. This exception
             will be raised.
         """
-        for name, obj in self._provided.items():
+        self._dep_graph = {}
+        queue: Deque[str] = deque(roots)
+        if not queue:
+            queue.extend(self._provided)
+
+        while queue:
+            name = queue.popleft()
+            if name in self._dep_graph or name == DEFAULT_LOGGER:
+                continue
+
+            obj = self._provided[name]
             if isfunction(obj):
-                dependencies = get_type_hints(obj)
+                dependencies = _cached_type_hints(obj)
             else:
-                dependencies = get_type_hints(obj.__init__)
+                dependencies = _cached_type_hints(obj.__init__)
 
-            concrete = {}
+            concrete: List[Tuple[str, str]] = []
 
             for key, dep in dependencies.items():
                 if key == "return":
                     continue
 
-                if issubclass(dep, Protocol):  # type: ignore
-                    match = self._search_protocol(dep)
-                    if match is None:
-                        raise MissingDependency(
-                            f"Can't build depdencies for {name}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                        )
-                else:
-                    match = self._search_concrete(dep)
-                    if match is None:
-                        raise MissingDependency(
-                            f"Can't build depdencies for {name}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                        )
+                match = self._search(dep)
+                if match is None:
+                    raise MissingDependency(
+                        f"Can't build depdencies for {name}. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
+                    )
+
+                concrete.append((key, match))
+                queue.append(match)
+            self._dep_graph[name] = tuple(concrete)
+
+    def build(self, *roots: Any) -> None:
+        """
+        `build` constructs the objects provided to the Harness. Objects from a previous build
+        are discarded.
 
-                concrete[key] = match
-            self._dep_graph[name] = concrete
+        Parameters
+        ----------
+        roots : Any
+            Optional class definitions or functional constructors that have been provided to the
+            Harness. When given, only these objects and their transitive dependencies are resolved
+            and constructed. Otherwise everything provided is built.
+
+        Raises
+        ------
+        UnknownConstructor
+            If one of the roots has not been provided to the Harness.
+        """
+        names = []
+        for root in roots:
+            name, _ = self._constructor_name(root)
+            if name not in self._provided:
+                raise UnknownConstructor(f"{root} not registered with jab harness")
+            names.append(name)
 
-    def build(self) -> None:
-        self._build_env()
+        self._build_env(names)
 
-    def _build_env(self) -> None:
+    def _build_env(self, roots: Iterable[str] = ()) -> None:
         """
         `build_env` takes the dependency graph and topologically sorts
         the Harness's dependencies and then constructs then in order,
         providing each constructor with the necessary constructed objects.
 
+        Parameters
+        ----------
+        roots : Iterable[str]
+            Names of the provided objects that must be built. If empty, every
+            provided object is built.
+
         Raises
         ------
-        toposort.CircularDependencyError
+        CircularDependency
             If a circular dependency exists in the provided objects this function
             will fail.
         """
-        self._build_graph()
+        self._env = {}
+        self._build_graph(roots)
 
-        deps = {}
+        graph = self._dep_graph
+        execution_order = _toposort({k: [v for _, v in reqs] for k, reqs in graph.items()})
+        self._exec_order = execution_order
 
-        for k, v in self._dep_graph.items():
-            deps[k] = {i for _, i in v.items()}
+        depth: Dict[str, int] = {}
+        self._exec_levels = []
+        for x in execution_order:
+            depth[x] = 1 + max((depth[v] for _, v in graph.get(x, ())), default=-1)
+            if depth[x] == len(self._exec_levels):
+                self._exec_levels.append([])
+            self._exec_levels[depth[x]].append(x)
 
-        execution_order = toposort.toposort_flatten(deps)
-        self._exec_order = execution_order
+        lifecycles: Dict[str, Dict[str, Tuple[Callable[..., Any], bool]]] = {}
         for x in execution_order:
 
             if x == DEFAULT_LOGGER:
                 continue
 
-            reqs = self._dep_graph[x]
-            kwargs = {k: self._env[v] for k, v in reqs.items()}
+            kwargs = {k: self._env[v] for k, v in self._dep_graph[x]}
 
             if iscoroutinefunction(self._provided[x]):
-                self._env[x] = self._loop.run_until_complete(self._provided[x](**kwargs))
+                self._env[x] = self._event_loop().run_until_complete(self._provided[x](**kwargs))
             else:
                 self._env[x] = self._provided[x](**kwargs)
 
+            lifecycle = {}
+            for method in LIFECYCLE_METHODS:
+                fn = getattr(self._env[x], method, None)
+                if fn is not None:
+                    lifecycle[method] = (fn, iscoroutinefunction(fn))
+            lifecycles[x] = lifecycle
+
+        self._run_calls = _lifecycle_calls(lifecycles, "run", execution_order)
+        self._stop_calls = [
+            _lifecycle_calls(lifecycles, "on_stop", level) for level in reversed(self._exec_levels)
+        ]
+        self._start_calls = self._plan_on_start(_lifecycle_calls(lifecycles, "on_start", execution_order))
+
+    def _search(self, dep: Any) -> Optional[str]:
+        """
+        `search` matches a dependency to an object provided to the Harness, dispatching
+        to `_search_protocol` for Protocol definitions and `_search_concrete` otherwise.
+
+        Parameters
+        ----------
+        dep : Any
+            The annotated type of the dependency.
+
+        Returns
+        -------
+        Optional[str]
+            The key-name of the matching object or None if no match can be found.
+        """
+        if _is_protocol(dep):
+            return self._search_protocol(dep)
+
+        return self._search_concrete(dep)
+
     def _search_protocol(self, dep: Any) -> Optional[str]:
         """
         `search_protocol` attempts to match a Protocol definition to an object
@@ -296,14 +506,7 @@ class Harness:
             If the appropriate object can be found, its key-name is returned. If
             an appropriate object can't be found, None is returned.
         """
-        for name, obj in self._provided.items():
-            if isfunction(obj):
-                obj = get_type_hints(obj)["return"]
-
-            if obj.__module__ == dep.__module__ and obj.__name__ == dep.__name__:
-                return name
-
-        return None
+        return self._concrete_index.get((dep.__module__, dep.__name__))
 
     def _check_provide(self, arg: Any) -> None:
         """
@@ -361,6 +564,49 @@ class Harness:
                 f"Provided argument '{arg.__name__}' does not have a type-annotated constructor"
             )
 
+    def _plan_on_start(self, starts: List[LifecycleCall]) -> List[StartCall]:
+        """
+        `_plan_on_start` resolves the dependencies of every `on_start` method and orders
+        the methods so that each is called after the `on_start` methods of its dependencies.
+        The plan is computed once per build and reused by every call to `_on_start`.
+
+        Parameters
+        ----------
+        starts : List[LifecycleCall]
+            The `on_start` methods of the constructed objects.
+
+        Raises
+        ------
+        MissingDependency
+            If an `on_start` method requires a dependency that has not been provided.
+        """
+        _on_start_deps = {}
+        _deps_map = {}
+        for x, fn, _ in starts:
+            in_ = get_type_hints(fn)
+
+            map_ = {}
+            for key, dep in in_.items():
+                if key == "return":
+                    continue
+
+                match = self._search(dep)
+                if match is None or match not in self._env:
+                    raise MissingDependency(
+                        f"Can't build dependencies for {x}'s on_start method. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
+                    )
+
+                map_[key] = match
+
+            _on_start_deps[x] = {dep for _, dep in map_.items()}
+            _deps_map[x] = {k: self._env[v] for k, v in map_.items()}
+
+        methods = {x: (fn, is_coro) for x, fn, is_coro in starts}
+
+        return [
+            (x, methods[x][0], methods[x][1], _deps_map[x]) for x in _toposort(_on_start_deps) if x in methods
+        ]
+
     async def _on_start(self) -> bool:
         """
         `_on_start` gathers and calls all `on_start` methods of the provided objects.
@@ -369,53 +615,15 @@ class Harness:
         to take arguments. The paramters must be satisfied by the objects or classes
         passed into the Harness's `provide` function like a constructor.
         """
-        _on_start_deps = {}
-        _deps_map = {}
-        for x in self._exec_order:
-            try:
-                in_ = get_type_hints(self._env[x].on_start)
-
-                map_ = {}
-                for key, dep in in_.items():
-                    if key == "return":
-                        continue
-
-                    if issubclass(dep, Protocol):  # type: ignore
-                        match = self._search_protocol(dep)
-                        if match is None:
-                            raise MissingDependency(
-                                f"Can't build dependencies for {x}'s on_start method. Missing suitable argument for parameter {key} [{str(dep)}]."  # NOQA
-                            )
-                    else:
-                        match = self._search_concrete(dep)
-                        if match is None:
-                            raise MissingDependency(
-                                f"Can't build dependencies for {x}'s on_start method. Missing suitable argument for paramater {key} [{str(dep)}]."  # NOQA
-                            )
-
-                    map_[key] = match
-
-                _on_start_deps[x] = {dep for _, dep in map_.items()}
-                _deps_map[x] = {k: self._env[v] for k, v in map_.items()}
-            except AttributeError:
-                pass
-
-        call_order = toposort.toposort_flatten(_on_start_deps)
-
         try:
             self._logger.debug("Executing on_start methods.")
 
-            for x in call_order:
-                kwargs = _deps_map.get(x, {})
-
-                try:
-                    if iscoroutinefunction(self._env[x].on_start):
-                        await self._env[x].on_start(**kwargs)
-                    else:
-                        self._env[x].on_start(**kwargs)
-                    self._logger.debug(f"Executed {x}.on_start()")
-                except AttributeError:
-                    pass
+            for x, fn, is_coro, kwargs in self._start_calls:
+                if is_coro:
+                    await fn(**kwargs)
+                else:
+                    fn(**kwargs)
+                self._logger.debug(f"Executed {x}.on_start()")
 
         except KeyboardInterrupt:
             self._logger.critical("Keyboard interrupt during execution of on_start methods.")
@@ -431,18 +639,22 @@ class Harness:
     async def _on_stop(self) -> None:
         """
         `_on_stop` gathers and calls all `on_stop` methods of the provided objects.
-        Unlike `_on_start` and `_run` it thee `on_stop` methods are called serially.
+        Objects are stopped one dependency level at a time, starting with the objects
+        nothing else depends on, so that dependents always stop before their dependencies.
+        The async `on_stop` methods within a level are run concurrently inside of a
+        `gather` call.
         """
-        for x in self._exec_order[::-1]:
-            try:
-                fn = self._env[x].on_stop
-                if iscoroutinefunction(fn):
-                    await fn()
+        for level in self._stop_calls:
+            stop_awaits = []
+            for x, fn, is_coro in level:
+                if is_coro:
+                    stop_awaits.append(fn())
+                    self._logger.debug(f"Added on_stop method for {x}")
                 else:
                     fn()
-                self._logger.debug(f"Executed on_stop method for {x}")
-            except AttributeError:
-                pass
+                    self._logger.debug(f"Executed on_stop method for {x}")
+
+            await asyncio.gather(*stop_awaits)
 
     def _run(self) -> None:
         """
@@ -451,18 +663,15 @@ class Harness:
         The main execution thread blocks until all of these `run` methods complete.
         """
         run_awaits = []
-        for x in self._exec_order:
-            try:
-                if not iscoroutinefunction(self._env[x].run):
-                    raise InvalidLifecycleMethod(f"{x}.run must be an async method")
-                run_awaits.append(self._env[x].run())
-                self._logger.debug(f"Added run method for {x}")
-            except AttributeError:
-                pass
+        for x, fn, is_coro in self._run_calls:
+            if not is_coro:
+                raise InvalidLifecycleMethod(f"{x}.run must be an async method")
+            run_awaits.append(fn())
+            self._logger.debug(f"Added run method for {x}")
 
         try:
             self._logger.debug("Executing run methods.")
-            self._loop.run_until_complete(asyncio.gather(*run_awaits))
+            self._event_loop().run_until_complete(asyncio.gather(*run_awaits))
         except KeyboardInterrupt:
             self._logger.critical("Keyboard interrupt during execution of run methods.")
         except Exception as e:
@@ -475,13 +684,14 @@ class Harness:
         """
         self.build()
 
-        interrupt = self._loop.run_until_complete(self._on_start())
+        loop = self._event_loop()
+        interrupt = loop.run_until_complete(self._on_start())
 
         if not interrupt:
             self._run()
 
-        self._loop.run_until_complete(self._on_stop())
-        self._loop.close()
+        loop.run_until_complete(self._on_stop())
+        loop.close()
 
     def asgi(self, scope: Dict[str, str]) -> Handler:
 
@@ -527,7 +737,8 @@ class Harness:
             if msg.get("type") == "lifespan.shutdown":
                 await self._on_stop()
                 await send({"type": "lifespan.shutdown.complete"})
-                self._loop.close()
+                if self._loop is not None:
+                    self._loop.close()
                 return
 
     def _asgi_http(self, scope: Dict[str, str]) -> Handler:
@@ -1,5 +1,7 @@
+from collections.abc import Hashable
+from functools import lru_cache
 from inspect import isfunction
-from typing import Type, Optional, get_type_hints, Callable, Any, Union
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set, Tuple, Type, Union, cast, get_type_hints
 
 from typing_extensions import Protocol, _get_protocol_attrs  # type: ignore
 
@@ -8,6 +10,81 @@ class ReturnedUnionType(Exception):
     pass
 
 
+_MISSING: Any = object()
+
+# Canonical instances of the annotation types seen by `_cached_type_hints`. `typing` already
+# returns the same object for repeated subscriptions such as `Union[X, Y]`, so this only merges
+# annotations that are equal but distinct, e.g. `Union[X, Y]` and `Union[Y, X]`, letting
+# comparisons in the hot path be settled by identity.
+_type_intern: Dict[Any, Any] = {}
+
+
+def _intern(t: Any) -> Any:
+    """
+    `_intern` returns the canonical instance of an annotation type. Unhashable annotations
+    are returned unchanged.
+    """
+    try:
+        return _type_intern.setdefault(t, t)
+    except TypeError:
+        return t
+
+
+@lru_cache(maxsize=None)
+def _cached_type_hints(obj: Any) -> Dict[str, Any]:
+    """
+    `_cached_type_hints` memoizes `get_type_hints` per class or function object. The
+    annotation values are interned and the returned dictionary is shared between callers,
+    so it must not be mutated.
+    """
+    return {k: _intern(v) for k, v in get_type_hints(obj).items()}
+
+
+@lru_cache(maxsize=None)
+def _is_protocol(t: Any) -> bool:
+    """
+    `_is_protocol` memoizes whether a type is a Protocol definition or a subclass of one.
+    It is equivalent to `issubclass(t, Protocol)` for classes but returns False instead
+    of raising for anything that isn't a class.
+    """
+    return bool(getattr(t, "_is_protocol", False)) or (isinstance(t, type) and Protocol in t.__mro__)
+
+
+@lru_cache(maxsize=None)
+def _cached_protocol_attrs(proto: Any) -> Set[str]:
+    """
+    `_cached_protocol_attrs` memoizes the attribute names that make up a Protocol definition.
+    """
+    return _get_protocol_attrs(proto)  # type: ignore
+
+
+@lru_cache(maxsize=None)
+def _attrs_of(cls_: Any) -> FrozenSet[str]:
+    """
+    `_attrs_of` returns every attribute name that is either defined on or annotated by
+    a class or any of its bases. It is used as a cheap pre-filter ahead of the full
+    signature comparison in `isimplementation` and never evaluates annotations.
+    """
+    annotated = (name for base in cls_.__mro__ for name in getattr(base, "__annotations__", {}))
+    return frozenset(dir(cls_)).union(annotated)
+
+
+@lru_cache(maxsize=None)
+def _protocol_spec(proto: Any) -> Tuple[Tuple[str, Any, bool, Any], ...]:
+    """
+    `_protocol_spec` precomputes the protocol side of `isimplementation` once per Protocol.
+    Each entry is `(attr, value, is_function, annotation)` where `value` is the result of
+    `getattr(proto, attr)` or `_MISSING` if the attribute is only annotated.
+    """
+    annotations = _cached_type_hints(proto)
+    spec = []
+    for attr in _cached_protocol_attrs(proto):
+        value = getattr(proto, attr, _MISSING)
+        spec.append((attr, value, isfunction(value), annotations.get(attr)))
+
+    return tuple(spec)
+
+
 def isimplementation(cls_: Optional[Type[Any]], proto: Type[Any]) -> bool:
     """
     `isimplementation` checks to see if a provided class definition implement a provided Protocol definition.
@@ -28,72 +105,107 @@ def isimplementation(cls_: Optional[Type[Any]], proto: Type[Any]) -> bool:
     if cls_ is None:
         return False
 
-    proto_annotations = get_type_hints(proto)
-    cls_annotations = get_type_hints(cls_)
+    return _isimplementation_cached(cast(Hashable, cls_), cast(Hashable, proto))
 
-    for attr in _get_protocol_attrs(proto):
-        try:
-            proto_concrete = getattr(proto, attr)
-            cls_concrete = getattr(cls_, attr)
-        except AttributeError:
-            proto_concrete = proto_annotations.get(attr)
+
+@lru_cache(maxsize=2048)
+def _isimplementation_cached(cls_: Any, proto: Any) -> bool:
+    """
+    `_isimplementation_cached` performs the actual structural comparison behind
+    `isimplementation`. Results are memoized per `(cls_, proto)` pair since the
+    check depends only on the two class definitions.
+    """
+    if not _cached_protocol_attrs(proto) <= _attrs_of(cls_):
+        return False
+
+    cls_annotations = _cached_type_hints(cls_)
+
+    for attr, proto_concrete, is_func, proto_annotation in _protocol_spec(proto):
+        cls_concrete = _MISSING if proto_concrete is _MISSING else getattr(cls_, attr, _MISSING)
+        if cls_concrete is _MISSING:
+            proto_concrete = proto_annotation
             cls_concrete = cls_annotations.get(attr)
+            is_func = False
 
         if cls_concrete is None:
             return False
 
-        if isfunction(proto_concrete):
+        if is_func:
             if not func_satisfies(cls_concrete, proto_concrete):
                 return False
 
             continue
 
-        if cls_concrete != proto_concrete:
+        if cls_concrete is not proto_concrete and cls_concrete != proto_concrete:
             return False
 
     return True
 
 
 def func_satisfies(impl: Callable[..., Any], proto: Callable[..., Any]) -> bool:
-    proto_signature = get_type_hints(proto)
+    if not isinstance(impl, Hashable):
+        return _func_satisfies(impl, proto)
+
+    return _func_satisfies_cached(impl, proto)
+
+
+@lru_cache(maxsize=4096)
+def _func_satisfies_cached(impl: Callable[..., Any], proto: Callable[..., Any]) -> bool:
+    """
+    `_func_satisfies_cached` memoizes `func_satisfies` per `(impl, proto)` function pair.
+    Calls that raise, such as `ReturnedUnionType`, are not cached and raise again on
+    every call.
+    """
+    return _func_satisfies(impl, proto)
+
+
+def _func_satisfies(impl: Callable[..., Any], proto: Callable[..., Any]) -> bool:
+    # Every annotated parameter of the protocol method must also be annotated on the
+    # implementation. Checking the raw annotation names first rejects most mismatches
+    # without evaluating any type hints.
+    impl_annotations = getattr(impl, "__annotations__", None)
+    if impl_annotations is None or not impl_annotations.keys() >= proto.__annotations__.keys():
+        return False
+
+    proto_signature = _cached_type_hints(proto)
 
     try:
-        impl_signature = get_type_hints(impl)
+        impl_signature = _cached_type_hints(impl)
     except AttributeError:
         return False
 
-    if issubclass(proto_signature.get("return"), Protocol):  # type: ignore
+    returns_protocol = False
+    if _is_protocol(proto_signature.get("return")):
         proto_return: Type[Any] = proto_signature["return"]
         cls_return: Optional[Type[Any]] = impl_signature.get("return")
-        if isimplementation(cls_return, proto_return):
-            impl_signature["return"] = proto_signature["return"]
+        returns_protocol = isimplementation(cls_return, proto_return)
 
     for param, proto_type in proto_signature.items():
+        if param == "return" and returns_protocol:
+            continue
+
         try:
             impl_type = impl_signature[param]
         except KeyError:
             return False
 
-        try:
-            # Handle the case in which the Implementation
-            # implements a satisfactory method with Union
-            # types
-            if impl_type.__origin__ is Union:
-                if proto_type not in impl_type.__args__:
-                    return False
-
-                if param == "return":
-                    raise ReturnedUnionType(
-                        f"Returned Union type found in {impl} implementation of {proto}. "
-                        + f"Desired type {proto_type} is present in {impl_type} but jab cannot determine"
-                        + f"if the desired type will be returned from defined input."
-                    )
-
-                continue
-        except AttributeError:
-            pass
-
-        if proto_type != impl_type:
+        # Handle the case in which the Implementation
+        # implements a satisfactory method with Union
+        # types
+        if getattr(impl_type, "__origin__", None) is Union:
+            if proto_type not in impl_type.__args__:
+                return False
+
+            if param == "return":
+                raise ReturnedUnionType(
+                    f"Returned Union type found in {impl} implementation of {proto}. "
+                    + f"Desired type {proto_type} is present in {impl_type} but jab cannot determine"
+                    + f"if the desired type will be returned from defined input."
+                )
+
+            continue
+
+        if proto_type is not impl_type and proto_type != impl_type:
             return False
 
     return True
@@ -6,7 +6,7 @@ if not (sys.version_info.major >= 3 and sys.version_info.minor >= 7):
 
 VERSION = "0.3.1"
 
-DEPENDENCIES = ["typing_extensions", "toposort", "uvloop"]
+DEPENDENCIES = ["typing_extensions", "uvloop"]
 
 setup(
     name="jab",
@@ -60,3 +60,17 @@ def test_play_well_with_others():
 
     assert user_one is user_one.jab()
     assert user_one.name == "Dave"
+
+
+class NeedsSample:
+    def __init__(self, s: SampleClass) -> None:
+        self.s = s
+
+
+def test_closure_concrete_dependency():
+    sample = SampleClass("stntngo")
+    h = jab.Harness().provide(sample.jab, NeedsSample)
+    h.build()
+
+    assert h._concrete_index[(SampleClass.__module__, "SampleClass")] == sample._jab
+    assert h._env["NeedsSample"].s is sample
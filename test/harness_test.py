@@ -1,10 +1,9 @@
 import asyncio
 from collections import Counter
 from inspect import isfunction
-from typing import get_type_hints
+from typing import Any, List, get_type_hints
 
 import pytest
-import toposort
 from typing_extensions import Protocol
 
 import jab
@@ -156,6 +155,53 @@ def FunctionalRequire(c: Counter) -> NeedsCounter:
     return NeedsCounter(c)
 
 
+class StopBase:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+
+    def on_stop(self) -> None:
+        self.events.append("base")
+
+
+class SlowStopOne:
+    def __init__(self, base: StopBase) -> None:
+        self.base = base
+
+    async def on_stop(self) -> None:
+        self.base.events.append("one-start")
+        await asyncio.sleep(0.05)
+        self.base.events.append("one-end")
+
+
+class SlowStopTwo:
+    def __init__(self, base: StopBase) -> None:
+        self.base = base
+
+    async def on_stop(self) -> None:
+        self.base.events.append("two-start")
+        await asyncio.sleep(0.05)
+        self.base.events.append("two-end")
+
+
+class BrokenOnStart:
+    def __init__(self) -> None:
+        self.ran = False
+
+    def on_start(self) -> None:
+        raise AttributeError("broken on_start")
+
+    async def run(self) -> None:
+        self.ran = True  # pragma: no cover
+
+
+class RecordsStop:
+    def __init__(self) -> None:
+        self.stopped: List[str] = []
+
+    def on_stop(self) -> None:
+        self.stopped.append("built")
+
+
 def test_harness() -> None:
     app = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber)
     app.build()
@@ -163,6 +209,49 @@ def test_harness() -> None:
     assert app._env["ClassBasic"].get_thing() == "Hello, 5!"
 
 
+def test_build_roots() -> None:
+    app = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber, ProvideCounter)
+    app.build(ClassBasic)
+    assert set(app._env) == {"ClassBasic", "ConcreteNumber"}
+    assert app._exec_order == ["ConcreteNumber", "ClassBasic"]
+
+    app.build(ProvideCounter)
+    assert set(app._env) == {"Counter"}
+    assert [x.name for x in app.inspect()] == ["Counter"]
+
+    with pytest.raises(jab.Exceptions.UnknownConstructor):
+        app.build(NeedsCounter)
+
+
+def test_build_roots_unrelated_missing_dep() -> None:
+    app = jab.Harness().provide(ClassBasic, ConcreteNumber, CircleOne)
+    app.build(ClassBasic)
+    assert app._env["ClassBasic"].get_thing() == "Hello, 5!"
+
+    with pytest.raises(jab.Exceptions.MissingDependency):
+        app.build()
+
+
+def test_exec_levels() -> None:
+    app = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber, ProvideCounter, NeedsCounter)
+    app.build()
+    assert [sorted(x) for x in app._exec_levels] == [
+        ["ConcreteNumber", "Counter"],
+        ["ClassBasic", "NeedsCounter"],
+        ["ClassNew"],
+    ]
+
+
+def test_on_stop_levels() -> None:
+    h = jab.Harness().provide(StopBase, SlowStopOne, SlowStopTwo)
+    h.run()
+
+    events = h._env["StopBase"].events
+    assert sorted(events[:2]) == ["one-start", "two-start"]
+    assert sorted(events[2:4]) == ["one-end", "two-end"]
+    assert events[4:] == ["base"]
+
+
 def test_mult_harness() -> None:
     first = jab.Harness().provide(ClassNew, ConcreteNumber)
     app = jab.Harness().provide(first, ClassBasic)
@@ -187,7 +276,12 @@ def test_sync_run() -> None:
 
 
 def test_circular_dependency() -> None:
-    with pytest.raises(toposort.CircularDependencyError):
+    with pytest.raises(jab.Exceptions.CircularDependency):
+        jab.Harness().provide(CircleOne, CircleTwo).build()
+
+
+def test_circular_dependency_path() -> None:
+    with pytest.raises(jab.Exceptions.CircularDependency, match="CircleOne -> CircleTwo -> CircleOne"):
         jab.Harness().provide(CircleOne, CircleTwo).build()
 
 
@@ -205,6 +299,31 @@ def test_on_start() -> None:
     jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber).run()
 
 
+def test_lazy_loop() -> None:
+    h = jab.Harness().provide(ClassNew, ClassBasic, ConcreteNumber)
+    h.build()
+    assert h._loop is None
+
+    h.run()
+    assert h._loop is not None and h._loop.is_closed()
+
+
+def test_lifecycle_attribute_error() -> None:
+    h = jab.Harness().provide(BrokenOnStart)
+    h.run()
+    assert not h._env["BrokenOnStart"].ran
+
+
+def test_lifecycle_bound_at_build() -> None:
+    h = jab.Harness().provide(RecordsStop)
+    h.build()
+
+    obj = h._env["RecordsStop"]
+    obj.on_stop = lambda: obj.stopped.append("replaced")
+    h._event_loop().run_until_complete(h._on_stop())
+    assert obj.stopped == ["built"]
+
+
 def test_logger() -> None:
     harness = jab.Harness().provide(NeedsLogger)
     harness.build()
@@ -218,6 +337,28 @@ def test_arugments_in_on_start() -> None:
     jab.Harness().provide(ArgedOnStart, ClassBasic, ConcreteNumber).run()
 
 
+def test_start_calls_per_build() -> None:
+    h = jab.Harness().provide(ArgedOnStart, ClassBasic, ConcreteNumber)
+    h.build()
+    start_calls = h._start_calls
+    assert [x for x, *_ in start_calls] == ["ClassBasic", "ArgedOnStart"]
+
+    def no_search(dep: Any) -> None:
+        raise AssertionError("on_start dependencies resolved again")  # pragma: no cover
+
+    h._search = no_search  # type: ignore
+    loop = h._event_loop()
+    assert not loop.run_until_complete(h._on_start())
+    assert not loop.run_until_complete(h._on_start())
+    assert h._start_calls is start_calls
+
+    del h._search
+    h.build()
+    assert h._start_calls is not start_calls
+    assert h._start_calls[0][1].__self__ is h._env["ClassBasic"]
+    loop.close()
+
+
 def test_functional_constructor() -> None:
     h = jab.Harness().provide(ProvideCounter, NeedsCounter)
     h.build()
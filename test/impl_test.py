@@ -3,7 +3,7 @@ from typing_extensions import Protocol, final
 
 import pytest
 
-from jab.search import isimplementation, ReturnedUnionType
+from jab.search import _cached_type_hints, _is_protocol, isimplementation, ReturnedUnionType
 
 
 @pytest.fixture()
@@ -144,3 +144,40 @@ def test_bad_overloaded(bad_overloaded):
 
     with pytest.raises(ReturnedUnionType):
         isimplementation(Overloaded, Names)
+
+
+def test_is_protocol(protocol, impl):
+    assert _is_protocol(protocol)
+    assert not _is_protocol(impl)
+    assert not _is_protocol(List[str])
+    assert not _is_protocol(None)
+
+
+def test_extra_impl_parameters():
+    class Greeter(Protocol):
+        def greet(self, name: str) -> str:
+            pass
+
+    class Loud:
+        def greet(self, name: str, punctuation: str = "!") -> str:
+            return name.upper() + punctuation
+
+    class Unnamed:
+        def greet(self, other: str) -> str:
+            return other
+
+    assert isimplementation(Loud, Greeter)
+    assert not isimplementation(Unnamed, Greeter)
+
+
+def test_interned_annotations():
+    def first(x: Union[int, str]) -> List[int]:
+        pass
+
+    def second(x: Union[str, int]) -> List[int]:
+        pass
+
+    assert Union[int, str] == Union[str, int] and Union[int, str] is not Union[str, int]
+
+    a, b = _cached_type_hints(first), _cached_type_hints(second)
+    assert a["x"] is b["x"]